@@ -1,45 +1,82 @@
-from fastapi import FastAPI, HTTPException, Query
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Any
+from fastapi import FastAPI, HTTPException, Query, __version__ as FASTAPI_VERSION
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional, Any
+from collections import OrderedDict
+import aiosmtplib  # Fully asynchronous SMTP client
 import asyncio
+import contextlib
+import functools
+import dns.asyncresolver  # Non-blocking DNS lookups on the event loop
 import dns.resolver  # Robust DNS lookup library
-import smtplib
-import socket
+import email_validator  # RFC syntax validation, run only after the cheap checks pass
 import os
+import time
 
 # --- 1. Configuration and Dependency Loading ---
 
-def load_blacklist(file_path: str) -> set[str]:
+def load_blacklist(file_path: str) -> frozenset[str]:
     """Loads blacklisted domains from a text file, filtering out invalid entries."""
-    if not os.path.exists(file_path):
-        print(f"Warning: Blacklist file not found at: {file_path}")
-        return set()
     try:
+        # Read the whole file and split it into lines in one call
         with open(file_path, "r", encoding="utf-8") as f:
-            return {line.strip().lower() for line in f if line.strip()}
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        print(f"Warning: Blacklist file not found at: {file_path}")
+        return frozenset()
     except Exception as e:
         print(f"Error loading blacklist: {e}")
-        return set()
+        return frozenset()
+    return frozenset(filter(None, (line.strip().lower() for line in lines)))
 
 BLACKLIST_FILE = "domains_blacklist.txt"
-BLACKLISTED_DOMAINS = load_blacklist(BLACKLIST_FILE)
+BLACKLISTED_DOMAINS = load_blacklist(BLACKLIST_FILE)  # Read-only frozenset after startup
 
 # Defined list of valid TLDs for stricter format checking
-VALID_TLDS = {".com", ".net", ".org", ".edu", ".gov", ".co", ".io", ".dev", ".info", ".biz", ".mx", ".es", ".app", ".xyz"}
+VALID_TLDS = frozenset({".com", ".net", ".org", ".edu", ".gov", ".co", ".io", ".dev", ".info", ".biz", ".mx", ".es", ".app", ".xyz"})
+VALID_TLD_TUPLE = tuple(VALID_TLDS)  # str.endswith accepts a tuple of suffixes and scans them in C
 
 # --- 2. API Initialization and Data Models ---
 
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs the idle SMTP session sweeper while the app is up and closes every pooled session on shutdown."""
+    sweeper = asyncio.create_task(_sweep_smtp_pool_periodically())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        await _sweep_smtp_pool(close_all=True)
+
+# FastAPI 0.130+ serializes response_model output straight to JSON bytes through Pydantic, but only
+# while the response class is left at its default (and it deprecates ORJSONResponse). Older releases
+# encode responses with json.dumps, so orjson is used as the default response class there.
+FASTAPI_NATIVE_JSON = tuple(int(part) for part in FASTAPI_VERSION.split(".")[:2]) >= (0, 130)
+RESPONSE_OPTIONS = {} if FASTAPI_NATIVE_JSON else {"default_response_class": ORJSONResponse}
+
 app = FastAPI(
     title="Email Validator API (V3.2 - Production Ready)",
     description="A robust and asynchronous API for email verification, including format, TLD, MX record, and optional SMTP validation. Includes workarounds for common DNS resolution failures.",
-    version="3.2.0"
+    version="3.2.0",
+    lifespan=lifespan,
+    **RESPONSE_OPTIONS
 )
 
+# Emails are accepted as plain strings; syntax is validated in _validate_one after the cheap checks.
+# The length cap (RFC 5321 path limit) also bounds the keys that reach is_valid_tld's cache.
+MAX_EMAIL_LENGTH = 254
+EmailField = Annotated[str, Field(max_length=MAX_EMAIL_LENGTH)]
+
 class EmailRequest(BaseModel):
-    email: EmailStr
+    email: EmailField
+
+MAX_BATCH_SIZE = 1000  # gather() creates every coroutine up front, so the batch size bounds memory
+
+class BatchRequest(BaseModel):
+    emails: List[EmailField] = Field(..., max_length=MAX_BATCH_SIZE)
 
 class ValidationResult(BaseModel):
-    is_valid_format: bool
+    is_valid_format: bool  # True only once the full syntax check has passed
     domain_exists: bool
     is_blacklisted: bool
     smtp_check_status: str  # 'success', 'refused', 'timeout', 'skipped', 'unknown'
@@ -51,130 +88,284 @@ class ValidationResult(BaseModel):
 
 ROLE_BASED_USERS = {"admin", "info", "support", "sales", "contact", "webmaster", "postmaster", "abuse", "hostmaster"}
 
+_DOT_TABLE = str.maketrans("", "", ".")  # Strips dots in a single C-level pass
+
 def is_role_based(email: str) -> bool:
     """Checks if the local part of the email is a common role-based address."""
-    local_part = email.split("@")[0].lower().split("+")[0].replace(".", "") 
-    return local_part in ROLE_BASED_USERS
+    local_part = email.rpartition("@")[0].lower()
+    plus = local_part.find("+")
+    if plus != -1:
+        local_part = local_part[:plus]
+    return local_part.translate(_DOT_TABLE) in ROLE_BASED_USERS
 
+@functools.lru_cache(maxsize=4096)
 def is_valid_tld(domain: str) -> bool:
     """Ensures the domain ends with a known TLD and has a name preceding it."""
-    sorted_tlds = sorted(list(VALID_TLDS), key=len, reverse=True)
+    # The TLD is the last label, so something precedes it when its dot is not the first character
+    return domain.endswith(VALID_TLD_TUPLE) and domain.rfind('.') > 0
+
+# Shared async resolver forced to reliable public DNS servers to mitigate local network DNS issues (NXDOMAIN).
+# Built once at import time (configure=False skips parsing /etc/resolv.conf) and reused by every request,
+# so dnspython's own answer cache is shared across requests too.
+ASYNC_RESOLVER = dns.asyncresolver.Resolver(configure=False)
+ASYNC_RESOLVER.nameservers = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
+ASYNC_RESOLVER.timeout = 2
+ASYNC_RESOLVER.lifetime = 4
+ASYNC_RESOLVER.cache = dns.resolver.LRUCache(max_size=100_000)
 
-    for tld in sorted_tlds:
-        if domain.endswith(tld):
-            # Check if the TLD is not the entire domain (i.e., ensure something precedes it)
-            tld_start_index = len(domain) - len(tld)
-            if tld_start_index > 0:
-                return True
-    return False
+# In-process TTL cache for MX lookups: domain -> (expires_at, mx_records), evicted in LRU order
+MX_CACHE: "OrderedDict[str, tuple[float, Optional[List[str]]]]" = OrderedDict()
+MX_CACHE_MAX_SIZE = 10000
+MX_NEGATIVE_TTL = 60  # Seconds to remember NXDOMAIN/NoAnswer results
+
+def _cache_mx_result(domain: str, mx_records: Optional[List[str]], ttl: float) -> None:
+    """Stores an MX lookup result, evicting the least recently used entry when full."""
+    MX_CACHE[domain] = (time.monotonic() + ttl, mx_records)
+    MX_CACHE.move_to_end(domain)
+    if len(MX_CACHE) > MX_CACHE_MAX_SIZE:
+        MX_CACHE.popitem(last=False)
+
+# In-flight MX lookups, so concurrent cache misses for the same domain share a single DNS query
+INFLIGHT: dict[str, asyncio.Future] = {}
 
 async def get_mx_records(domain: str) -> Optional[List[str]]:
     """
-    Asynchronously resolves MX records by executing the synchronous dnspython 
-    resolver in a thread. Explicitly sets public nameservers to mitigate local network DNS issues (NXDOMAIN).
+    Returns the MX records for a domain, serving them from MX_CACHE when fresh and
+    coalescing concurrent lookups for the same domain onto one in-flight query.
     """
-    loop = asyncio.get_event_loop()
-    
-    def sync_mx_lookup():
-        # Function executed in a separate thread
-        try:
-            # Force the use of reliable public DNS resolvers
-            resolver = dns.resolver.Resolver()
-            resolver.nameservers = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
-            
-            # Resolve the MX query without a strict lifetime/timeout
-            mx_answers = resolver.resolve(domain, 'MX') 
-            
-            # Process and order results by preference
-            mx_records = [str(answer.exchange).rstrip('.') for answer in mx_answers]
-            mx_records.sort(key=lambda x: [
-                int(mx.preference) 
-                for mx in mx_answers if str(mx.exchange).rstrip('.') == x
-            ][0])
-            return mx_records
-        except dns.resolver.NXDOMAIN:
-            return None  # Domain does not exist
-        except dns.resolver.NoAnswer:
-            return []    # Domain exists, but no MX records
-        except Exception:
-            # Catch all other network/DNS resolution errors
-            return None 
+    entry = MX_CACHE.get(domain)
+    if entry:
+        if entry[0] > time.monotonic():
+            MX_CACHE.move_to_end(domain)
+            return entry[1]
+        del MX_CACHE[domain]
+
+    fut = INFLIGHT.get(domain)
+    if fut is None:
+        fut = asyncio.ensure_future(_resolve_mx_records(domain))
+        INFLIGHT[domain] = fut
+        fut.add_done_callback(lambda _: INFLIGHT.pop(domain, None))
+
+    # Shield the shared lookup so one cancelled request does not cancel it for every waiter
+    return await asyncio.shield(fut)
+
+async def _resolve_mx_records(domain: str) -> Optional[List[str]]:
+    """
+    Asynchronously resolves MX records with dnspython's async resolver, keeping the lookup
+    on the event loop instead of occupying a thread from the default executor.
+    Results are cached for the record TTL (negative answers for MX_NEGATIVE_TTL seconds).
+    """
+    try:
+        mx_answers = await ASYNC_RESOLVER.resolve(domain, 'MX')
 
-    # Run the synchronous function in asyncio's thread pool
-    return await loop.run_in_executor(None, sync_mx_lookup)
+        # Process and order results by preference in a single pass
+        pairs = [(int(answer.preference), answer.exchange.to_text().rstrip('.')) for answer in mx_answers]
+        pairs.sort()
+        mx_records = [host for _, host in pairs]
+        # expiration is absolute and already accounts for time spent in dnspython's cache and the
+        # lowest TTL across any CNAME chain; rrset.ttl is neither decremented nor chain-aware
+        _cache_mx_result(domain, mx_records, max(0, mx_answers.expiration - time.time()))
+        return mx_records
+    except dns.resolver.NXDOMAIN:
+        _cache_mx_result(domain, None, MX_NEGATIVE_TTL)
+        return None  # Domain does not exist
+    except dns.resolver.NoAnswer:
+        _cache_mx_result(domain, [], MX_NEGATIVE_TTL)
+        return []    # Domain exists, but no MX records
+    except Exception:
+        # Catch all other network/DNS resolution errors (not cached, they may be transient)
+        return None 
 
 # --- FUNCIÓN check_smtp CORREGIDA ---
 
-async def check_smtp(email: str, mx_records: List[str]) -> tuple[str, str]:
+# Idle SMTP sessions kept open per MX host so repeat checks skip the connect + HELO handshake.
+# Entries are (connection, uses, last_used) tuples.
+SMTP_POOL: dict[str, asyncio.Queue] = {}
+SMTP_POOL_SIZE = 4            # Max idle connections per MX host (avoid tripping rate limits)
+SMTP_POOL_MAX_USES = 20       # Recycle a connection after this many RCPT TO probes
+SMTP_POOL_IDLE_TIMEOUT = 30   # Seconds before an idle connection is considered stale
+
+async def _close_smtp_connection(conn: aiosmtplib.SMTP) -> None:
+    """Politely ends an SMTP session, ignoring errors from already-broken connections."""
+    try:
+        await conn.quit() 
+    except Exception:
+        conn.close()
+
+async def _acquire_smtp_connection(mx_server: str) -> tuple[aiosmtplib.SMTP, int]:
+    """Returns a pooled SMTP session for the MX host, or opens a new one if none is reusable."""
+    pool = SMTP_POOL.get(mx_server)
+    while pool is not None and not pool.empty():
+        conn, uses, last_used = pool.get_nowait()
+        if pool.empty() and SMTP_POOL.get(mx_server) is pool:
+            del SMTP_POOL[mx_server]  # Drop empty host queues so the pool does not grow per MX host
+        if conn.is_connected and time.monotonic() - last_used < SMTP_POOL_IDLE_TIMEOUT:
+            return conn, uses
+        await _close_smtp_connection(conn)
+
+    return await _open_smtp_connection(mx_server), 0
+
+async def _open_smtp_connection(mx_server: str) -> aiosmtplib.SMTP:
+    """Opens a new SMTP session to the MX host and greets it."""
+    conn = aiosmtplib.SMTP(hostname=mx_server, port=25, timeout=4, start_tls=False)
+    try:
+        await conn.connect()
+        await conn.helo(hostname='email-validator.example.com')
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+async def _release_smtp_connection(mx_server: str, conn: aiosmtplib.SMTP, uses: int) -> None:
+    """Returns a reset SMTP session to the pool, closing it if worn out or the pool is full."""
+    if uses >= SMTP_POOL_MAX_USES:
+        await _close_smtp_connection(conn)
+        return
+    pool = SMTP_POOL.setdefault(mx_server, asyncio.Queue(maxsize=SMTP_POOL_SIZE))
+    try:
+        pool.put_nowait((conn, uses, time.monotonic()))
+    except asyncio.QueueFull:
+        await _close_smtp_connection(conn)
+
+async def _sweep_smtp_pool(close_all: bool = False) -> None:
+    """Closes pooled sessions idle past SMTP_POOL_IDLE_TIMEOUT (or all of them) and drops empty host queues."""
+    now = time.monotonic()
+    stale = []
+    for mx_server, pool in list(SMTP_POOL.items()):
+        fresh = []
+        while not pool.empty():
+            entry = pool.get_nowait()
+            if close_all or now - entry[2] >= SMTP_POOL_IDLE_TIMEOUT:
+                stale.append(entry[0])
+            else:
+                fresh.append(entry)
+        for entry in fresh:
+            pool.put_nowait(entry)
+        if not fresh:
+            del SMTP_POOL[mx_server]
+    await asyncio.gather(*(_close_smtp_connection(conn) for conn in stale))
+
+async def _sweep_smtp_pool_periodically() -> None:
+    """Background task that closes idle sessions for hosts that are not checked again."""
+    while True:
+        await asyncio.sleep(SMTP_POOL_IDLE_TIMEOUT)
+        await _sweep_smtp_pool()
+
+# Caps concurrent RCPT TO probes per MX host so batches do not trigger rate limiting or greylisting
+SMTP_HOST_CONCURRENCY = int(os.environ.get("SMTP_HOST_CONCURRENCY", "4"))
+if SMTP_HOST_CONCURRENCY < 1:
+    raise ValueError(f"SMTP_HOST_CONCURRENCY must be at least 1, got {SMTP_HOST_CONCURRENCY}")
+# mx_server -> [semaphore, holders + waiters]; entries are removed once nobody uses them
+PER_HOST_SEM: dict[str, list] = {}
+
+@contextlib.asynccontextmanager
+async def _per_host_slot(mx_server: str):
+    """Holds one of the SMTP_HOST_CONCURRENCY probe slots for the MX host."""
+    entry = PER_HOST_SEM.get(mx_server)
+    if entry is None:
+        entry = PER_HOST_SEM[mx_server] = [asyncio.Semaphore(SMTP_HOST_CONCURRENCY), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del PER_HOST_SEM[mx_server]
+
+async def check_smtp(email: str, mx_records: List[str], batch_slot: Optional[asyncio.Semaphore] = None) -> tuple[str, str]:
     """Attempts to connect to the highest priority MX server to verify mailbox existence."""
-    
     mx_server = mx_records[0]
-    loop = asyncio.get_event_loop()
+    # Wait for the per-host limit before taking a batch slot, so checks queued on one busy
+    # MX host cannot hold slots that validations for other domains need
+    async with _per_host_slot(mx_server):
+        async with batch_slot or contextlib.nullcontext():
+            return await _probe_smtp(email, mx_server)
+
+async def _probe_smtp(email: str, mx_server: str) -> tuple[str, str]:
+    """Runs the MAIL FROM / RCPT TO dialog against a single MX server."""
+    
     conn = None # Initialize conn outside try block for finally clause
 
     try:
-        # 1. Conexión y Bloqueos de Red
-        conn = smtplib.SMTP(timeout=4)
-        # Execute the blocking connect call in the executor
-        await loop.run_in_executor(None, conn.connect, mx_server, 25)
-        
-        # 2. Diálogo SMTP
-        conn.helo('email-validator.example.com') 
+        # 1. Reuse a pooled session or connect
+        conn, uses = await _acquire_smtp_connection(mx_server)
 
-        # MAIL FROM check
-        code, _ = conn.mail('test@example.com')
-        if code != 250:
-            return 'refused', "Server refused MAIL FROM command."
+        # 2. Diálogo SMTP
+        # MAIL FROM check (aiosmtplib raises on any non-250 reply)
+        try:
+            await conn.mail('test@example.com')
+        except Exception:
+            if uses == 0:
+                raise
+            # A reused session may have been dropped by the server while idle (e.g. 421); retry once on a fresh one
+            await _close_smtp_connection(conn)
+            conn = None
+            conn, uses = await _open_smtp_connection(mx_server), 0
+            await conn.mail('test@example.com')
 
         # RCPT TO check (core existence test)
-        code, msg = conn.rcpt(email)
-        
+        try:
+            code = (await conn.rcpt(email)).code
+        except aiosmtplib.SMTPRecipientRefused as e:
+            code = e.code
+
         if code == 250:
-            return 'success', "The mail server confirmed the email address exists (Code 250)."
+            status = 'success', "The mail server confirmed the email address exists (Code 250)."
         elif code in (550, 553):
-            return 'refused', "Mailbox does not exist (550/553) or server explicitly rejected the address."
+            status = 'refused', "Mailbox does not exist (550/553) or server explicitly rejected the address."
         else:
-            return 'refused', f"Server rejected the recipient with code {code}."
+            status = 'refused', f"Server rejected the recipient with code {code}."
 
-    except (socket.timeout, TimeoutError):
+        # RSET instead of QUIT so the session can serve the next check. The verdict is already known,
+        # so a server that disconnects or rejects RSET only gets its connection evicted.
+        try:
+            await conn.rset()
+        except Exception:
+            pass
+        else:
+            await _release_smtp_connection(mx_server, conn, uses + 1)
+            conn = None
+
+        return status
+
+    except (aiosmtplib.SMTPTimeoutError, TimeoutError):
         return 'timeout', f"Connection to the mail server ({mx_server}) timed out."
-    except smtplib.SMTPConnectError:
+    except aiosmtplib.SMTPConnectError:
         return 'refused', f"Could not connect to the mail server ({mx_server}) on port 25."
-    except (smtplib.SMTPServerDisconnected, ConnectionResetError, socket.error):
+    except aiosmtplib.SMTPSenderRefused:
+        return 'refused', "Server refused MAIL FROM command."
+    except (aiosmtplib.SMTPServerDisconnected, ConnectionResetError, OSError):
         return 'timeout', f"The mail server or network unexpectedly disconnected during validation. Status is uncertain."
     except Exception:
         return 'unknown', "An unexpected critical error occurred."
     finally:
+        # Connections that were not returned to the pool are evicted
         if conn:
-            try:
-                conn.quit() 
-                conn.close()
-            except Exception:
-                pass
+            await _close_smtp_connection(conn)
     
 
-# --- 4. API Endpoints ---
-
-@app.get("/", include_in_schema=False)
-async def health_check():
-    """Endpoint to check if the API is running."""
-    return {"status": "ok", "service": "Email Validator API", "version": app.version}
-
+def _reject_domain(domain: str, result: dict) -> None:
+    """Records why a domain failed the blacklist or strict TLD check in the result."""
+    if domain in BLACKLISTED_DOMAINS:
+        result["is_blacklisted"] = True
+        result["message"] = f"The domain '{domain}' is blacklisted and should not be used."
+    else:
+        # Strict TLD Check (prevents malformed domains like 'example.com.com')
+        result["message"] = f"The domain '{domain}' does not appear to have a valid Top-Level Domain."
 
-@app.post("/validate", response_model=ValidationResult)
-async def validate_email(
-    request: EmailRequest,
-    smtp_check_enabled: bool = Query(True, description="Enable SMTP verification (slower but provides mailbox existence guarantee)")
-):
+async def _check_address(email: str, smtp_check_enabled: bool) -> tuple[dict, str, Optional[List[str]]]:
     """
-    Performs full email validation against format, TLD, blacklist, MX records, and SMTP.
+    Runs every validation stage before SMTP and returns (result, normalized email, mx_records).
+    mx_records is None when a stage already settled the result.
+    The cheap in-memory checks run first so blacklisted or malformed domains are rejected
+    before the full syntax validator and without waiting on the network.
     """
-    email = request.email
-    domain = email.split("@")[-1].lower()
+    domain = email.rpartition("@")[2].lower()
 
-    # 1. Initialize Result (Format is guaranteed by Pydantic EmailStr)
+    # 1. Initialize Result
     result = {
-        "is_valid_format": True,
+        "is_valid_format": False,
         "domain_exists": False,
         "is_blacklisted": False,
         "smtp_check_status": "skipped" if not smtp_check_enabled else "unknown",
@@ -183,34 +374,59 @@ async def validate_email(
         "mx_records": None
     }
     
-    # 2. Blacklist Check
-    if domain in BLACKLISTED_DOMAINS:
-        result["is_blacklisted"] = True
-        result["message"] = f"The domain '{domain}' is blacklisted and should not be used."
-        return result
+    # 2-3. Blacklist and Strict TLD Checks on the raw domain (cheap rejection path).
+    # Non-ASCII domains may still normalize to a valid TLD, so only ASCII ones are rejected here.
+    if domain in BLACKLISTED_DOMAINS or (domain.isascii() and not is_valid_tld(domain)):
+        _reject_domain(domain, result)
+        return result, email, None
 
-    # 3. Strict TLD Check (prevents malformed domains like 'example.com.com')
-    if not is_valid_tld(domain):
-        result["message"] = f"The domain '{domain}' does not appear to have a valid Top-Level Domain."
-        return result
+    # 4. Full Syntax Check (only for addresses that survived the fast checks)
+    try:
+        validated = email_validator.validate_email(email, check_deliverability=False)
+    except email_validator.EmailNotValidError as e:
+        result["message"] = f"The email '{email}' is not a valid address. Detail: {e}"
+        return result, email, None
+    email = validated.normalized
+
+    # Repeat the domain checks on the normalized domain so that look-alike spellings
+    # (e.g. fullwidth letters) cannot bypass the blacklist
+    if validated.ascii_domain != domain:
+        domain = validated.ascii_domain
+        if domain in BLACKLISTED_DOMAINS or not is_valid_tld(domain):
+            _reject_domain(domain, result)
+            return result, email, None
 
-    # 4. MX Records Check (DNS existence)
+    # Only set once every domain check passed, so a rejection reads the same whatever the spelling
+    result["is_valid_format"] = True
+
+    # 5. MX Records Check (DNS existence)
     mx_records = await get_mx_records(domain)
     
     if mx_records is None:
         result["message"] = f"The domain '{domain}' does not exist (NXDOMAIN)."
-        return result
+        return result, email, None
     
     if mx_records:
         result["domain_exists"] = True
         result["mx_records"] = mx_records
     else:
         result["message"] = f"The domain '{domain}' exists, but no Mail Exchange (MX) records were found."
-        return result
+        return result, email, None
+
+    return result, email, mx_records
+
+async def _validate_one(email: str, smtp_check_enabled: bool, batch_slot: Optional[asyncio.Semaphore] = None) -> dict:
+    """
+    Runs the validation pipeline for a single email address.
+    When batch_slot is given it is held for the DNS/format stages, released, and only re-taken
+    for the SMTP probe once the per-host limit admits it (see check_smtp).
+    """
+    async with batch_slot or contextlib.nullcontext():
+        result, email, mx_records = await _check_address(email, smtp_check_enabled)
 
-    # 5. SMTP Validation Check
-    if smtp_check_enabled:
-        smtp_status, smtp_message = await check_smtp(email, mx_records)
+    # 6. SMTP Validation Check
+    if smtp_check_enabled and mx_records:
+        smtp_status, smtp_message = await check_smtp(email, mx_records, batch_slot)
         
         result["smtp_check_status"] = smtp_status
         
@@ -229,4 +445,56 @@ async def validate_email(
         result["message"] = "Basic validation successful. Domain is valid, but mailbox existence was not verified (SMTP check skipped)."
         
 
-    return result
\ No newline at end of file
+    return result
+
+
+# Caps validations running at once across all batch requests to avoid overwhelming upstream resolvers
+BATCH_CONCURRENCY = 256
+BATCH_SEMAPHORE = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+
+# --- 4. API Endpoints ---
+
+@app.get("/", include_in_schema=False)
+async def health_check():
+    """Endpoint to check if the API is running."""
+    return {"status": "ok", "service": "Email Validator API", "version": app.version}
+
+
+@app.post("/validate", response_model=ValidationResult)
+async def validate_email(
+    request: EmailRequest,
+    smtp_check_enabled: bool = Query(True, description="Enable SMTP verification (slower but provides mailbox existence guarantee)")
+):
+    """
+    Performs full email validation against format, TLD, blacklist, MX records, and SMTP.
+    """
+    return await _validate_one(request.email, smtp_check_enabled)
+
+
+@app.post("/validate/batch", response_model=List[ValidationResult])
+async def validate_email_batch(
+    request: BatchRequest,
+    smtp_check_enabled: bool = Query(True, description="Enable SMTP verification (slower but provides mailbox existence guarantee)")
+):
+    """
+    Validates many email addresses concurrently, returning one result per email in request order.
+    """
+    results = await asyncio.gather(
+        *(_validate_one(email, smtp_check_enabled, BATCH_SEMAPHORE) for email in request.emails),
+        return_exceptions=True
+    )
+
+    # A failure in one validation must not fail the whole batch
+    return [
+        result if not isinstance(result, BaseException) else {
+            "is_valid_format": False,
+            "domain_exists": False,
+            "is_blacklisted": False,
+            "smtp_check_status": "unknown",
+            "is_role_based": is_role_based(email),
+            "message": "Validation failed due to an unexpected server error.",
+            "mx_records": None
+        }
+        for email, result in zip(request.emails, results)
+    ]